@@ -1,58 +1,105 @@
 """Handle AGENTS.md/CLAUDE.md file detection and modification."""
 
+import os
 from pathlib import Path
 
-from rich.console import Console
+from logfire_setup.console import get_console
 
-console = Console()
+AGENT_CONFIG_FILENAMES = ("AGENTS.md", "CLAUDE.md")
 
+# Key phrases that indicate Logfire instructions, searched for as raw bytes
+_LOGFIRE_MARKERS = (
+    b"# Logfire Best Practices",
+    b"logfire.configure()",
+    b"https://logfire.pydantic.dev",
+)
 
-def resolve_real_file(path: Path) -> Path:
+# Files are scanned in blocks; consecutive blocks overlap so that a marker
+# split across a block boundary is still found.
+_SCAN_BLOCK_SIZE = 64 * 1024
+_SCAN_OVERLAP = max(len(m) for m in _LOGFIRE_MARKERS) - 1
+
+
+def _scan_dir(directory: Path) -> dict[str, os.DirEntry[str]]:
     """
-    Resolve a path to its real file, following symlinks.
+    List a directory once, keyed by entry name.
 
     Args:
-        path: Path to resolve
+        directory: Directory to list
 
     Returns:
-        Real path after following all symlinks
+        Mapping of entry name to directory entry, empty if the directory is missing.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+
+def _find_file_entry(
+    directory: Path, entries: dict[str, os.DirEntry[str]], name: str
+) -> os.DirEntry[str] | None:
     """
-    return path.resolve()
+    Look up a regular file in a directory listing, as the filesystem would.
+
+    An exact match needs no syscall. A name differing only in case is only
+    accepted when the filesystem itself resolves `name` to a file, i.e. on
+    case-insensitive filesystems such as the macOS and Windows defaults.
+
+    Args:
+        directory: Directory the listing was read from
+        entries: Directory listing from _scan_dir
+        name: File name to look for
+
+    Returns:
+        The matching file entry, or None if there is none.
+    """
+    entry = entries.get(name)
+    if entry is None:
+        folded = name.casefold()
+        entry = next(
+            (e for key, e in entries.items() if key.casefold() == folded), None
+        )
+        if entry is None or not os.path.isfile(directory / name):
+            return None
+    return entry if entry.is_file() else None
 
 
 def find_agent_config_file(project_dir: Path | None = None) -> Path | None:
     """
     Find AGENTS.md or CLAUDE.md file in the project directory.
 
-    Follows symlinks to find the real file location.
+    Reads the project directory once and only looks inside `.claude` when
+    neither file is at the top level.
 
     Args:
         project_dir: Project directory to search. Defaults to current directory.
 
     Returns:
-        Path to the real file (after resolving symlinks), or None if not found.
+        Path to the file, or None if not found.
     """
     if project_dir is None:
         project_dir = Path.cwd()
 
-    # Check for AGENTS.md
-    agents_md = project_dir / "AGENTS.md"
-    if agents_md.exists():
-        return resolve_real_file(agents_md)
-
-    # Check for CLAUDE.md
-    claude_md = project_dir / "CLAUDE.md"
-    if claude_md.exists():
-        return resolve_real_file(claude_md)
+    # Check for AGENTS.md, then CLAUDE.md
+    entries = _scan_dir(project_dir)
+    for name in AGENT_CONFIG_FILENAMES:
+        entry = _find_file_entry(project_dir, entries, name)
+        if entry is not None:
+            return Path(entry.path)
 
     # Check in .claude directory (common location)
-    claude_dir_agents = project_dir / ".claude" / "AGENTS.md"
-    if claude_dir_agents.exists():
-        return resolve_real_file(claude_dir_agents)
+    claude_dir = entries.get(".claude")
+    if claude_dir is None or not claude_dir.is_dir():
+        return None
 
-    claude_dir_claude = project_dir / ".claude" / "CLAUDE.md"
-    if claude_dir_claude.exists():
-        return resolve_real_file(claude_dir_claude)
+    claude_path = Path(claude_dir.path)
+    claude_entries = _scan_dir(claude_path)
+    for name in AGENT_CONFIG_FILENAMES:
+        entry = _find_file_entry(claude_path, claude_entries, name)
+        if entry is not None:
+            return Path(entry.path)
 
     return None
 
@@ -68,17 +115,35 @@ def check_if_logfire_instructions_exist(file_path: Path) -> bool:
         True if Logfire instructions already exist
     """
     try:
-        content = file_path.read_text()
-        # Look for key phrases that indicate Logfire instructions
-        return (
-            "# Logfire Best Practices" in content
-            or "logfire.configure()" in content
-            or "https://logfire.pydantic.dev" in content
-        )
+        with open(file_path, "rb") as f:
+            tail = b""
+            while block := f.read(_SCAN_BLOCK_SIZE):
+                data = tail + block
+                if any(marker in data for marker in _LOGFIRE_MARKERS):
+                    return True
+                tail = data[-_SCAN_OVERLAP:]
+        return False
     except Exception:
         return False
 
 
+def _separator_for_tail(tail: bytes) -> str:
+    """
+    Pick the separator to put between existing content and appended instructions.
+
+    Args:
+        tail: Last (up to) two bytes of the existing file
+
+    Returns:
+        Separator text ending in a `---` rule and a blank line
+    """
+    if not tail:
+        return "---\n\n"
+    if tail.endswith(b"\n\n"):
+        return "\n---\n\n"
+    return "\n\n---\n\n"
+
+
 def append_instructions_to_file(file_path: Path, instructions: str) -> bool:
     """
     Append Logfire instructions to a file.
@@ -91,29 +156,24 @@ def append_instructions_to_file(file_path: Path, instructions: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        # Read existing content
-        if file_path.exists():
-            existing_content = file_path.read_text()
-            # Add separator if file is not empty
-            if existing_content and not existing_content.endswith("\n\n"):
-                separator = "\n\n---\n\n"
-            else:
-                separator = (
-                    "\n---\n\n" if existing_content.endswith("\n") else "---\n\n"
-                )
-        else:
-            existing_content = ""
-            separator = ""
-
-        # Append instructions
-        new_content = existing_content + separator + instructions + "\n"
-
-        # Write back
-        file_path.write_text(new_content)
+        try:
+            f = open(file_path, "rb+")
+        except FileNotFoundError:
+            file_path.write_bytes((instructions + "\n").encode())
+            return True
+
+        with f:
+            # Only the last two bytes are needed to pick the separator
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 2))
+            separator = _separator_for_tail(f.read(2))
+
+            # Append instructions
+            f.write((separator + instructions + "\n").encode())
         return True
 
     except Exception as e:
-        console.print(f"[red]Error writing to {file_path}: {e}[/red]")
+        get_console().print(f"[red]Error writing to {file_path}: {e}[/red]")
         return False
 
 
@@ -133,7 +193,7 @@ def create_new_agents_md(project_dir: Path, instructions: str) -> Path | None:
         agents_md.write_text(instructions + "\n")
         return agents_md
     except Exception as e:
-        console.print(f"[red]Error creating AGENTS.md: {e}[/red]")
+        get_console().print(f"[red]Error creating AGENTS.md: {e}[/red]")
         return None
 
 
@@ -154,6 +214,8 @@ def add_instructions_to_project(
     if project_dir is None:
         project_dir = Path.cwd()
 
+    console = get_console()
+
     # Find existing file
     existing_file = find_agent_config_file(project_dir)
 
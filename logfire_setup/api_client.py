@@ -1,14 +1,6 @@
 """Simple API client for fetching Logfire projects."""
 
-import sys
-from pathlib import Path
-
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
-
-import httpx
+from logfire_setup.auth_checker import load_default_toml
 
 
 def get_user_token() -> tuple[str | None, str | None]:
@@ -18,17 +10,14 @@ def get_user_token() -> tuple[str | None, str | None]:
     Returns:
         Tuple of (token, base_url) or (None, None) if not found
     """
-    default_file = Path.home() / ".logfire" / "default.toml"
-
-    if not default_file.exists():
-        return None, None
-
     try:
-        with open(default_file, "rb") as f:
-            data = tomllib.load(f)
+        data = load_default_toml()
     except Exception:
         return None, None
 
+    if data is None:
+        return None, None
+
     tokens = data.get("tokens", {})
     if not tokens:
         return None, None
@@ -54,6 +43,9 @@ def fetch_user_projects() -> list[dict[str, str]] | None:
     if not token or not base_url:
         return None
 
+    # Imported lazily: httpx is slow to import and only needed for this call
+    import httpx
+
     try:
         response = httpx.get(
             f"{base_url}/v1/writable-projects/",
@@ -1,9 +1,13 @@
 """Check Logfire authentication status and environment variables."""
 
 from dataclasses import dataclass
+from functools import lru_cache
+import os
+import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
 if sys.version_info >= (3, 11):
     import tomllib
@@ -18,6 +22,85 @@ class AuthStatus:
     base_url: str | None = None
 
 
+_ISO_SECONDS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_ISO_SECONDS_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+_DOTENV_TOKEN_RE = re.compile(rb"^\s*LOGFIRE_TOKEN=", re.MULTILINE)
+
+
+def get_default_toml_path() -> Path:
+    """Get the path to the Logfire credentials file, ~/.logfire/default.toml."""
+    return Path.home() / ".logfire" / "default.toml"
+
+
+@lru_cache(maxsize=1)
+def _parse_default_toml(path: Path, mtime_ns: int) -> dict[str, Any]:
+    """
+    Parse a TOML file, cached by path and modification time.
+
+    Args:
+        path: Path to the TOML file
+        mtime_ns: The file's st_mtime_ns. It is unused here but part of the
+            cache key, so a rewritten file is parsed again.
+
+    Returns:
+        Parsed TOML data.
+    """
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_default_toml(path: Path | None = None) -> dict[str, Any] | None:
+    """
+    Load and parse ~/.logfire/default.toml.
+
+    The parsed data is cached for as long as the file's mtime is unchanged, so
+    repeated checks in a single run only read the file once.
+
+    Args:
+        path: Path to the file. Defaults to ~/.logfire/default.toml.
+
+    Returns:
+        Parsed TOML data, or None if the file doesn't exist.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+        tomllib.TOMLDecodeError: If the file isn't valid TOML.
+    """
+    if path is None:
+        path = get_default_toml_path()
+
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    return _parse_default_toml(path, mtime_ns)
+
+
+def _is_unexpired(expiration: str, now: datetime, now_iso: str) -> bool:
+    """
+    Check whether a token expiration timestamp (UTC) is still in the future.
+
+    Timestamps that start with `YYYY-MM-DDTHH:MM:SS` are compared as strings,
+    which orders them correctly; only timestamps in another format, or within
+    the current second, are parsed with `datetime.fromisoformat`.
+
+    Raises:
+        ValueError: If the timestamp can't be parsed.
+        AttributeError: If the timestamp isn't a string.
+    """
+    if isinstance(expiration, str) and _ISO_SECONDS_RE.match(expiration):
+        expiration_seconds = expiration[:19]
+        if expiration_seconds != now_iso:
+            return expiration_seconds > now_iso
+
+    expiration_dt = datetime.fromisoformat(expiration.rstrip("Z")).replace(
+        tzinfo=timezone.utc
+    )
+    return now < expiration_dt
+
+
 def check_authentication() -> AuthStatus:
     """
     Check if user is authenticated with Logfire.
@@ -25,19 +108,18 @@ def check_authentication() -> AuthStatus:
     Returns:
         Tuple of (is_authenticated, message)
     """
-    default_file = Path.home() / ".logfire" / "default.toml"
-
-    if not default_file.exists():
-        return AuthStatus(
-            False, "Not authenticated. Run `logfire auth` to authenticate."
-        )
+    default_file = get_default_toml_path()
 
     try:
-        with open(default_file, "rb") as f:
-            data = tomllib.load(f)
+        data = load_default_toml(default_file)
     except Exception as e:
         return AuthStatus(False, f"Error reading authentication file: {e}")
 
+    if data is None:
+        return AuthStatus(
+            False, "Not authenticated. Run `logfire auth` to authenticate."
+        )
+
     # Check if we have any valid (non-expired) tokens
     tokens = data.get("tokens", {})
     if not tokens:
@@ -46,13 +128,12 @@ def check_authentication() -> AuthStatus:
         )
 
     # Check for at least one non-expired token
+    now = datetime.now(tz=timezone.utc)
+    now_iso = now.strftime(_ISO_SECONDS_FORMAT)
     for base_url, token_data in tokens.items():
         expiration = token_data.get("expiration", "")
         try:
-            expiration_dt = datetime.fromisoformat(expiration.rstrip("Z")).replace(
-                tzinfo=timezone.utc
-            )
-            if datetime.now(tz=timezone.utc) < expiration_dt:
+            if _is_unexpired(expiration, now, now_iso):
                 return AuthStatus(
                     True, f"Authenticated (credentials in {default_file})", base_url
                 )
@@ -65,28 +146,28 @@ def check_authentication() -> AuthStatus:
     )
 
 
-def check_env_token() -> AuthStatus:
+def check_env_token(project_dir: Path | None = None) -> AuthStatus:
     """
     Check if LOGFIRE_TOKEN environment variable is set.
 
+    Args:
+        project_dir: Directory to look for .env in. Defaults to current directory.
+
     Returns:
         Tuple of (has_token, location) where location is "environment", ".env", or None
     """
-    import os
-
     # Check environment variables
     if "LOGFIRE_TOKEN" in os.environ:
         return AuthStatus(True, "Token found in environment")
 
     # Check .env file
-    env_file = Path.cwd() / ".env"
-    if env_file.exists():
+    if project_dir is None:
+        project_dir = Path.cwd()
+    env_file = project_dir / ".env"
+    if os.path.isfile(env_file):
         try:
-            content = env_file.read_text()
-            for line in content.splitlines():
-                line = line.strip()
-                if line.startswith("LOGFIRE_TOKEN="):
-                    return AuthStatus(True, "Token found in .env file")
+            if _DOTENV_TOKEN_RE.search(env_file.read_bytes()):
+                return AuthStatus(True, "Token found in .env file")
         except Exception:
             pass
 
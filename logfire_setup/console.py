@@ -0,0 +1,15 @@
+"""Shared rich console, created lazily to keep rich out of import time."""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@cache
+def get_console() -> "Console":
+    """Create the rich console on first use and return the same one afterwards."""
+    from rich.console import Console
+
+    return Console()
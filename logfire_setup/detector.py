@@ -1,7 +1,11 @@
 """Detect existing dependencies in a project to pre-select relevant Logfire integrations."""
 
+import os
+import re
 import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Any
 
 if sys.version_info >= (3, 11):
     import tomllib
@@ -10,70 +14,59 @@ else:
 
 from logfire_setup.categories import Integration, get_all_integrations
 
+# Leading package name of a requirement string, before any extras, version
+# specifiers or environment markers
+_PKG_NAME_RE = re.compile(r"^\s*([A-Za-z0-9_.\-]+)")
 
-def parse_pyproject_toml(path: Path) -> set[str]:
-    """Parse pyproject.toml and extract all dependency package names."""
-    try:
-        with open(path, "rb") as f:
-            data = tomllib.load(f)
-    except (FileNotFoundError, tomllib.TOMLDecodeError):
-        return set()
 
-    packages = set()
+def _extract_pkg_names(deps: Iterable[str]) -> set[str]:
+    """Extract the lowercased package names from requirement strings."""
+    return {m.group(1).lower() for m in map(_PKG_NAME_RE.match, deps) if m}
+
+
+def _build_pattern_index() -> dict[str, list[Integration]]:
+    """Map each package pattern to the integrations it detects."""
+    index: dict[str, list[Integration]] = {}
+    for integration in get_all_integrations():
+        for pattern in integration.package_patterns:
+            index.setdefault(pattern, []).append(integration)
+    return index
+
+
+# Several integrations can share a pattern (e.g. aiohttp client and server)
+_PATTERN_INDEX = _build_pattern_index()
+_PATTERNS = frozenset(_PATTERN_INDEX)
+
+
+def _iter_deps(data: dict[str, Any]) -> Iterator[str]:
+    """Yield raw dependency strings from every section of a parsed pyproject.toml."""
+    project = data.get("project", {})
 
     # Check [project.dependencies]
-    if "project" in data and "dependencies" in data["project"]:
-        for dep in data["project"]["dependencies"]:
-            # Extract package name (before any version specifier)
-            pkg_name = (
-                dep.split("[")[0]
-                .split(">=")[0]
-                .split("==")[0]
-                .split("<")[0]
-                .split(">")[0]
-                .strip()
-            )
-            packages.add(pkg_name.lower())
+    yield from project.get("dependencies", [])
 
     # Check [project.optional-dependencies]
-    if "project" in data and "optional-dependencies" in data["project"]:
-        for group_deps in data["project"]["optional-dependencies"].values():
-            for dep in group_deps:
-                pkg_name = (
-                    dep.split("[")[0]
-                    .split(">=")[0]
-                    .split("==")[0]
-                    .split("<")[0]
-                    .split(">")[0]
-                    .strip()
-                )
-                packages.add(pkg_name.lower())
-
-    # Check [dependency-groups] (PEP 735)
-    if "dependency-groups" in data:
-        for group_deps in data["dependency-groups"].values():
-            for dep in group_deps:
-                pkg_name = (
-                    dep.split("[")[0]
-                    .split(">=")[0]
-                    .split("==")[0]
-                    .split("<")[0]
-                    .split(">")[0]
-                    .strip()
-                )
-                packages.add(pkg_name.lower())
+    for group_deps in project.get("optional-dependencies", {}).values():
+        yield from group_deps
+
+    # Check [dependency-groups] (PEP 735), skipping {include-group = ...} entries
+    for group_deps in data.get("dependency-groups", {}).values():
+        yield from (dep for dep in group_deps if isinstance(dep, str))
 
     # Check [tool.poetry.dependencies] for Poetry projects
-    if (
-        "tool" in data
-        and "poetry" in data["tool"]
-        and "dependencies" in data["tool"]["poetry"]
-    ):
-        for pkg_name in data["tool"]["poetry"]["dependencies"].keys():
-            if pkg_name != "python":
-                packages.add(pkg_name.lower())
+    poetry_deps = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+    yield from (pkg_name for pkg_name in poetry_deps if pkg_name != "python")
 
-    return packages
+
+def parse_pyproject_toml(path: Path) -> set[str]:
+    """Parse pyproject.toml and extract all dependency package names."""
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (FileNotFoundError, tomllib.TOMLDecodeError):
+        return set()
+
+    return _extract_pkg_names(_iter_deps(data))
 
 
 def parse_requirements_txt(path: Path) -> set[str]:
@@ -84,27 +77,10 @@ def parse_requirements_txt(path: Path) -> set[str]:
     except FileNotFoundError:
         return set()
 
-    packages = set()
-    for line in lines:
-        line = line.strip()
-        # Skip comments and empty lines
-        if not line or line.startswith("#"):
-            continue
-        # Skip flags like -e or -r
-        if line.startswith("-"):
-            continue
-        # Extract package name
-        pkg_name = (
-            line.split("[")[0]
-            .split(">=")[0]
-            .split("==")[0]
-            .split("<")[0]
-            .split(">")[0]
-            .strip()
-        )
-        packages.add(pkg_name.lower())
-
-    return packages
+    # Skip comments, empty lines and flags like -e or -r
+    return _extract_pkg_names(
+        line for line in map(str.strip, lines) if line and line[0] not in "#-"
+    )
 
 
 def detect_project_dependencies(project_dir: Path | None = None) -> set[str]:
@@ -116,12 +92,14 @@ def detect_project_dependencies(project_dir: Path | None = None) -> set[str]:
 
     # Try pyproject.toml first
     pyproject_path = project_dir / "pyproject.toml"
-    if pyproject_path.exists():
+    if os.path.isfile(pyproject_path):
         packages.update(parse_pyproject_toml(pyproject_path))
+        if packages:
+            return packages
 
     # Fall back to requirements.txt
     requirements_path = project_dir / "requirements.txt"
-    if requirements_path.exists():
+    if os.path.isfile(requirements_path):
         packages.update(parse_requirements_txt(requirements_path))
 
     return packages
@@ -129,16 +107,20 @@ def detect_project_dependencies(project_dir: Path | None = None) -> set[str]:
 
 def match_integrations_to_dependencies(dependencies: set[str]) -> list[Integration]:
     """Match detected dependencies to Logfire integrations."""
-    matched_integrations = []
-
-    for integration in get_all_integrations():
-        # Check if any of the package patterns match the detected dependencies
-        for pattern in integration.package_patterns:
-            if pattern.lower() in dependencies:
-                matched_integrations.append(integration)
-                break
-
-    return matched_integrations
+    # Check which package patterns appear in the detected dependencies
+    hits = dependencies & _PATTERNS
+    if not hits:
+        return []
+
+    matched_extras = {
+        integration.extra for pattern in hits for integration in _PATTERN_INDEX[pattern]
+    }
+    # Keep the category order of the matched integrations
+    return [
+        integration
+        for integration in get_all_integrations()
+        if integration.extra in matched_extras
+    ]
 
 
 def detect_integrations(project_dir: Path | None = None) -> list[Integration]:
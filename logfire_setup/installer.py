@@ -1,11 +1,12 @@
 """Handle installation of Logfire with selected extras using uv."""
 
+import os
+import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
-from rich.console import Console
-
-console = Console()
+from logfire_setup.console import get_console
 
 
 class InstallationError(Exception):
@@ -14,6 +15,12 @@ class InstallationError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def _uv_path() -> str | None:
+    """Locate the uv executable on PATH, once per process."""
+    return shutil.which("uv")
+
+
 def install_logfire(extras: list[str], project_dir: Path | None = None) -> bool:
     """
     Install logfire with the specified extras using uv.
@@ -32,20 +39,14 @@ def install_logfire(extras: list[str], project_dir: Path | None = None) -> bool:
         project_dir = Path.cwd()
 
     # Check if uv is available
-    try:
-        result = subprocess.run(
-            ["uv", "--version"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode != 0:
-            raise InstallationError("uv is not installed or not available in PATH")
-    except FileNotFoundError:
+    uv = _uv_path()
+    if uv is None:
         raise InstallationError(
             "uv is not installed. Please install it from https://docs.astral.sh/uv/"
         )
 
+    console = get_console()
+
     # Build the package spec
     if extras:
         extras_str = ",".join(extras)
@@ -55,31 +56,40 @@ def install_logfire(extras: list[str], project_dir: Path | None = None) -> bool:
 
     console.print(f"\n[bold cyan]Installing {package_spec}...[/bold cyan]\n")
 
-    # Run uv add
+    # Run uv add, streaming its output (uv reports progress on stderr)
     try:
-        result = subprocess.run(
-            ["uv", "add", package_spec],
+        with subprocess.Popen(
+            [uv, "add", package_spec],
             cwd=project_dir,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=False,
-        )
+            bufsize=1,
+        ) as process:
+            assert process.stdout is not None
+            for line in process.stdout:
+                console.print(line.rstrip("\n"), markup=False, highlight=False)
 
-        if result.returncode == 0:
+        if process.returncode == 0:
             console.print(
                 f"[bold green]✓[/bold green] Successfully installed {package_spec}"
             )
-            if result.stdout:
-                console.print(result.stdout)
             return True
         else:
             console.print(f"[bold red]✗[/bold red] Failed to install {package_spec}")
-            if result.stderr:
-                console.print(f"[red]{result.stderr}[/red]")
-            if result.stdout:
-                console.print(result.stdout)
             return False
 
+    except FileNotFoundError as e:
+        # Raised both for a missing executable and for a missing cwd
+        if os.path.exists(uv):
+            console.print(f"[bold red]✗[/bold red] Installation error: {e}")
+            return False
+
+        # uv was removed from PATH after it was located
+        _uv_path.cache_clear()
+        raise InstallationError(
+            "uv is not installed. Please install it from https://docs.astral.sh/uv/"
+        )
     except Exception as e:
         console.print(f"[bold red]✗[/bold red] Installation error: {e}")
         return False
@@ -87,12 +97,4 @@ def install_logfire(extras: list[str], project_dir: Path | None = None) -> bool:
 
 def check_uv_available() -> bool:
     """Check if uv is available in the system."""
-    try:
-        result = subprocess.run(
-            ["uv", "--version"],
-            capture_output=True,
-            check=False,
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+    return _uv_path() is not None
@@ -1,11 +1,12 @@
 """Generate Logfire usage instructions for AGENTS.md/CLAUDE.md files."""
 
+import sys
+from functools import lru_cache
+
 from logfire_setup.categories import Integration
 
 
-def generate_core_instructions() -> str:
-    """Generate core Logfire instructions that are always included."""
-    return """# Logfire
+_CORE_INSTRUCTIONS = """# Logfire
 
 ## Setup
 
@@ -88,118 +89,142 @@ Use message templates for structured data rather than string concatenation to en
 """
 
 
+def generate_core_instructions() -> str:
+    """Generate core Logfire instructions that are always included."""
+    return _CORE_INSTRUCTIONS
+
+
+def _interned(snippets: dict[str, str]) -> dict[str, str]:
+    """Intern a snippet table so it shares keys with the interned extras."""
+    return {
+        sys.intern(extra): sys.intern(snippet) for extra, snippet in snippets.items()
+    }
+
+
+# Instrumentation snippet emitted for each integration, by extra name
+_WEB_SNIPPETS: dict[str, str] = _interned(
+    {
+        "fastapi": "logfire.instrument_fastapi(app)\n",
+        "django": "logfire.instrument_django()\n",
+        "flask": "logfire.instrument_flask(app)\n",
+        "starlette": "logfire.instrument_starlette(app)\n",
+    }
+)
+_HTTP_SNIPPETS: dict[str, str] = _interned(
+    {
+        "httpx": (
+            "# Global instrumentation (all clients)\n"
+            "logfire.instrument_httpx()\n\n"
+            "# Per-client instrumentation\n"
+            "async with httpx.AsyncClient() as client:\n"
+            "    logfire.instrument_httpx(client)\n\n"
+            "# Capture all request/response data\n"
+            "async with httpx.AsyncClient() as client:\n"
+            "    logfire.instrument_httpx(client, capture_request_json_body=True, capture_response_json_body=True)\n"
+        ),
+        "requests": "logfire.instrument_requests()\n",
+        "aiohttp-client": "logfire.instrument_aiohttp_client()\n",
+    }
+)
+_DB_SNIPPETS: dict[str, str] = _interned(
+    {
+        "sqlalchemy": "logfire.instrument_sqlalchemy(engine=engine)\n",
+        "pymongo": "logfire.instrument_pymongo()\n",
+        "redis": "logfire.instrument_redis()\n",
+    }
+)
+# Database drivers that need no explicit instrumentation call
+_AUTO_INSTRUMENTED_DBS = frozenset(map(sys.intern, {"asyncpg", "psycopg", "psycopg2"}))
+_LLM_SNIPPETS: dict[str, str] = _interned(
+    {
+        "google-genai": "# Google GenAI auto-instrumentation via opentelemetry\n",
+        "litellm": "# LiteLLM auto-instrumentation via openinference\n",
+    }
+)
+_OTHER_SNIPPETS: dict[str, str] = _interned(
+    {
+        "celery": "logfire.instrument_celery()\n",
+        "system-metrics": "logfire.instrument_system_metrics()\n",
+    }
+)
+
+# Integrations listed under each instrumentation section; anything else is "other"
+_WEB = frozenset(map(sys.intern, {"fastapi", "django", "flask", "starlette"}))
+_HTTP = frozenset(map(sys.intern, {"httpx", "requests", "aiohttp-client"}))
+_DB = frozenset(
+    map(
+        sys.intern,
+        {"sqlalchemy", "asyncpg", "psycopg", "psycopg2", "pymongo", "redis", "mysql"},
+    )
+)
+_LLM = frozenset(map(sys.intern, {"google-genai", "litellm"}))
+
+# Snippet emitted for each integration, looked up by extra in a single table
+_SNIPPETS: dict[str, str] = {
+    **_WEB_SNIPPETS,
+    **_HTTP_SNIPPETS,
+    **_DB_SNIPPETS,
+    **_LLM_SNIPPETS,
+    **_OTHER_SNIPPETS,
+}
+
+_CATEGORY_OF: dict[str, str] = {
+    **dict.fromkeys(_WEB, "web"),
+    **dict.fromkeys(_HTTP, "http"),
+    **dict.fromkeys(_DB, "db"),
+    **dict.fromkeys(_LLM, "llm"),
+}
+
+# Instrumentation sections in output order, as (header, bucket)
+_SECTIONS: tuple[tuple[str, str], ...] = (
+    ("\n# Web framework\n", "web"),
+    ("\n# HTTP clients\n", "http"),
+    ("\n# Databases\n", "db"),
+    (
+        "\n# LLM & AI\n"
+        "# Pydantic AI (built-in instrumentation)\n"
+        "logfire.instrument_pydantic_ai()\n\n",
+        "llm",
+    ),
+    ("\n# Other\n", "other"),
+)
+
+
 def generate_integration_instructions(integrations: list[Integration]) -> str:
     """Generate integration-specific instructions based on selected integrations."""
     if not integrations:
         return ""
 
-    instructions = "\n## Instrumentation\n\n```python\n"
-    instructions += (
-        "import logfire\n\nlogfire.configure(send_to_logfire='if-token-present')\n"
-    )
+    parts = [
+        "\n## Instrumentation\n\n```python\n",
+        "import logfire\n\nlogfire.configure(send_to_logfire='if-token-present')\n",
+    ]
 
     # Group by common patterns
-    web_frameworks: list[Integration] = []
-    http_clients: list[Integration] = []
-    databases: list[Integration] = []
-    llm_ai: list[Integration] = []
-    other: list[Integration] = []
-
+    buckets: dict[str, list[Integration]] = {bucket: [] for _, bucket in _SECTIONS}
     for integration in integrations:
-        if integration.extra in ["fastapi", "django", "flask", "starlette"]:
-            web_frameworks.append(integration)
-        elif integration.extra in ["httpx", "requests", "aiohttp-client"]:
-            http_clients.append(integration)
-        elif integration.extra in [
-            "sqlalchemy",
-            "asyncpg",
-            "psycopg",
-            "psycopg2",
-            "pymongo",
-            "redis",
-            "mysql",
-        ]:
-            databases.append(integration)
-        elif integration.extra in ["google-genai", "litellm"]:
-            llm_ai.append(integration)
-        else:
-            other.append(integration)
-
-    # Add web framework instrumentation
-    if web_frameworks:
-        instructions += "\n# Web framework\n"
-        for integration in web_frameworks:
-            if integration.extra == "fastapi":
-                instructions += "logfire.instrument_fastapi(app)\n"
-            elif integration.extra == "django":
-                instructions += "logfire.instrument_django()\n"
-            elif integration.extra == "flask":
-                instructions += "logfire.instrument_flask(app)\n"
-            elif integration.extra == "starlette":
-                instructions += "logfire.instrument_starlette(app)\n"
-
-    # Add HTTP client instrumentation
-    if http_clients:
-        instructions += "\n# HTTP clients\n"
-        for integration in http_clients:
-            if integration.extra == "httpx":
-                instructions += "# Global instrumentation (all clients)\n"
-                instructions += "logfire.instrument_httpx()\n\n"
-                instructions += "# Per-client instrumentation\n"
-                instructions += "async with httpx.AsyncClient() as client:\n"
-                instructions += "    logfire.instrument_httpx(client)\n\n"
-                instructions += "# Capture all request/response data\n"
-                instructions += "async with httpx.AsyncClient() as client:\n"
-                instructions += "    logfire.instrument_httpx(client, capture_request_json_body=True, capture_response_json_body=True)\n"
-            elif integration.extra == "requests":
-                instructions += "logfire.instrument_requests()\n"
-            elif integration.extra == "aiohttp-client":
-                instructions += "logfire.instrument_aiohttp_client()\n"
-
-    # Add database instrumentation
-    if databases:
-        instructions += "\n# Databases\n"
-        for integration in databases:
-            if integration.extra == "sqlalchemy":
-                instructions += "logfire.instrument_sqlalchemy(engine=engine)\n"
-            elif integration.extra in ["asyncpg", "psycopg", "psycopg2"]:
-                instructions += f"# {integration.display_name} is auto-instrumented\n"
-            elif integration.extra == "pymongo":
-                instructions += "logfire.instrument_pymongo()\n"
-            elif integration.extra == "redis":
-                instructions += "logfire.instrument_redis()\n"
-
-    # Add LLM/AI instrumentation
-    if llm_ai:
-        instructions += "\n# LLM & AI\n"
-        instructions += "# Pydantic AI (built-in instrumentation)\n"
-        instructions += "logfire.instrument_pydantic_ai()\n\n"
-        for integration in llm_ai:
-            if integration.extra == "google-genai":
-                instructions += (
-                    "# Google GenAI auto-instrumentation via opentelemetry\n"
-                )
-            elif integration.extra == "litellm":
-                instructions += "# LiteLLM auto-instrumentation via openinference\n"
-
-    # Add other instrumentation
-    if other:
-        instructions += "\n# Other\n"
-        for integration in other:
-            if integration.extra == "celery":
-                instructions += "logfire.instrument_celery()\n"
-            elif integration.extra == "system-metrics":
-                instructions += "logfire.instrument_system_metrics()\n"
-
-    instructions += "```\n\n"
-    instructions += "For detailed integration docs, see: https://logfire.pydantic.dev/docs/integrations/\n"
-
-    return instructions
+        buckets[_CATEGORY_OF.get(integration.extra, "other")].append(integration)
+
+    for header, bucket in _SECTIONS:
+        items = buckets[bucket]
+        if not items:
+            continue
+        parts.append(header)
+        for integration in items:
+            if integration.extra in _AUTO_INSTRUMENTED_DBS:
+                parts.append(f"# {integration.display_name} is auto-instrumented\n")
+            else:
+                parts.append(_SNIPPETS.get(integration.extra, ""))
+
+    parts.append("```\n\n")
+    parts.append(
+        "For detailed integration docs, see: https://logfire.pydantic.dev/docs/integrations/\n"
+    )
 
+    return "".join(parts)
 
-def generate_mcp_instructions() -> str:
-    """Generate instructions for using Logfire MCP."""
-    return """
+
+_MCP_INSTRUCTIONS = """
 ## Using Logfire MCP
 
 The Logfire MCP (Model Context Protocol) server is configured for this project. Use it to:
@@ -210,6 +235,27 @@ The Logfire MCP (Model Context Protocol) server is configured for this project.
 """
 
 
+def generate_mcp_instructions() -> str:
+    """Generate instructions for using Logfire MCP."""
+    return _MCP_INSTRUCTIONS
+
+
+@lru_cache(maxsize=8)
+def _generate_instructions_cached(
+    selected_integrations: tuple[Integration, ...], mcp_configured: bool
+) -> str:
+    """Generate instructions, cached since the preview and the final write match."""
+    parts = [generate_core_instructions()]
+
+    if mcp_configured:
+        parts.append(generate_mcp_instructions())
+
+    if selected_integrations:
+        parts.append(generate_integration_instructions(list(selected_integrations)))
+
+    return "".join(parts)
+
+
 def generate_instructions(
     selected_integrations: list[Integration], mcp_configured: bool = False
 ) -> str:
@@ -223,12 +269,6 @@ def generate_instructions(
     Returns:
         Complete instructions text ready to be added to AGENTS.md/CLAUDE.md.
     """
-    instructions = generate_core_instructions()
-
-    if mcp_configured:
-        instructions += generate_mcp_instructions()
-
-    if selected_integrations:
-        instructions += generate_integration_instructions(selected_integrations)
-
-    return instructions
+    if not selected_integrations and not mcp_configured:
+        return _CORE_INSTRUCTIONS
+    return _generate_instructions_cached(tuple(selected_integrations), mcp_configured)
@@ -1,20 +1,18 @@
 """Main CLI entry point for logfire-setup."""
 
-import json
-import subprocess
+import os
 import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
-
-import questionary
-from questionary import Style
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm
+from typing import TYPE_CHECKING
 
 from logfire_setup.agents_md import add_instructions_to_project, find_agent_config_file
 from logfire_setup.api_client import fetch_user_projects
 from logfire_setup.auth_checker import check_authentication, check_env_token
 from logfire_setup.categories import CATEGORIES, Integration
+from logfire_setup.console import get_console
 from logfire_setup.detector import detect_integrations
 from logfire_setup.installer import (
     InstallationError,
@@ -28,23 +26,66 @@ from logfire_setup.mcp_checker import (
     get_read_token_url,
 )
 
-console = Console()
+if TYPE_CHECKING:
+    from questionary import Choice, Style
+
+# questionary and rich are imported where they are used, so importing this
+# module loads neither; questionary is only loaded once a prompt is shown.
+
+
+@cache
+def _checkbox_style() -> "Style":
+    """Create the questionary style shared by all prompts on first use."""
+    from questionary import Style
+
+    return Style(
+        [
+            ("pointer", "fg:#E620E9 bold"),  # the pointer used to select
+            ("selected", "fg:#f9a4f7 bold"),  # style for a selected item of a checkbox
+            ("highlighted", "fg:#E620E9 bold"),  # the currently highlighted option
+            ("separator", "fg:#E620E9"),  # the highlight on selected options
+            ("disabled", "fg:#858585 italic"),
+        ]
+    )
+
+
+@dataclass
+class RunState:
+    """State shared between the steps of a single setup run."""
+
+    project_url: str | None = None  # project_url from logfire_credentials.json
 
-LOGFIRE_CHECKBOX_STYLE = Style([
-    ('pointer', 'fg:#E620E9 bold'), # the pointer used to select
-    ('selected', 'fg:#f9a4f7 bold'), # style for a selected item of a checkbox
-    ('highlighted', 'fg:#E620E9 bold'), # the currently highlighted option
-    ('separator', 'fg:#E620E9'),  # the highlight on selected options
-    ('disabled', 'fg:#858585 italic'),
-])
 
-project_url: str | None = (
-    None  # Global variable to hold project_url from logfire_credentials.json
+# All non-recommended integrations, alphabetically sorted by display_name
+_OTHER_INTEGRATIONS_SORTED: tuple[Integration, ...] = tuple(
+    sorted(
+        (
+            integration
+            for category in CATEGORIES[1:]  # Skip Recommended
+            for integration in category.integrations
+        ),
+        key=lambda i: i.display_name.lower(),
+    )
 )
 
+# Checkbox label for each integration, by extra name, with and without the
+# detected marker
+_LABEL_PLAIN: dict[str, str] = {
+    integration.extra: f"{integration.display_name} - {integration.description}"
+    for category in CATEGORIES
+    for integration in category.integrations
+}
+_LABEL_DETECTED: dict[str, str] = {
+    extra: f"{label} [DETECTED ✓]" for extra, label in _LABEL_PLAIN.items()
+}
+
 
 def print_welcome():
     """Print welcome message."""
+    from rich.panel import Panel
+
+    console = get_console()
+
     console.print()
     console.print(
         Panel.fit(
@@ -58,6 +99,8 @@ def print_welcome():
 
 def detect_and_display_dependencies(project_dir: Path) -> list[Integration]:
     """Detect existing dependencies and display them."""
+    console = get_console()
+
     console.print("[bold]Detecting existing dependencies...[/bold]")
 
     detected_integrations = detect_integrations(project_dir)
@@ -75,12 +118,34 @@ def detect_and_display_dependencies(project_dir: Path) -> list[Integration]:
     return detected_integrations
 
 
+def _integration_choices(
+    integrations: Iterable[Integration], detected_extras: frozenset[str]
+) -> list["Choice"]:
+    """Build checkbox choices, pre-checking and marking detected integrations."""
+    from questionary import Choice
+
+    choices = []
+    for integration in integrations:
+        detected = integration.extra in detected_extras
+        labels = _LABEL_DETECTED if detected else _LABEL_PLAIN
+        choices.append(
+            Choice(title=labels[integration.extra], value=integration, checked=detected)
+        )
+    return choices
+
+
 def prompt_integration_selection(
     detected_integrations: list[Integration],
 ) -> list[Integration]:
     """Prompt user to select integrations from categories."""
+    import questionary
+
+    console = get_console()
+
     selected_integrations: list[Integration] = []
-    detected_extras = {integration.extra for integration in detected_integrations}
+    detected_extras = frozenset(
+        integration.extra for integration in detected_integrations
+    )
 
     console.print("[bold]Select Logfire integrations to install:[/bold]\n")
     console.print(
@@ -93,23 +158,12 @@ def prompt_integration_selection(
         f"[bold cyan]{recommended_category.name}[/bold cyan] - {recommended_category.description}\n"
     )
 
-    choices: list[questionary.Choice] = []
-    for integration in recommended_category.integrations:
-        label = f"{integration.display_name} - {integration.description}"
-        if integration.extra in detected_extras:
-            label += " [DETECTED ✓]"
-        choices.append(
-            questionary.Choice(
-                title=label,
-                value=integration,
-                checked=integration.extra in detected_extras,
-            )
-        )
+    choices = _integration_choices(recommended_category.integrations, detected_extras)
 
     selected = questionary.checkbox(
         "Select integrations:",
         choices=choices,
-        style=LOGFIRE_CHECKBOX_STYLE,
+        style=_checkbox_style(),
     ).ask()
 
     # Handle Ctrl+C
@@ -129,30 +183,12 @@ def prompt_integration_selection(
         "[bold cyan]Other Integrations[/bold cyan] - Additional framework and library instrumentation\n"
     )
 
-    other_integrations: list[Integration] = []
-    for category in CATEGORIES[1:]:  # Skip Recommended
-        other_integrations.extend(category.integrations)
-
-    # Sort alphabetically by display_name
-    other_integrations.sort(key=lambda i: i.display_name.lower())
-
-    choices = []
-    for integration in other_integrations:
-        label = f"{integration.display_name} - {integration.description}"
-        if integration.extra in detected_extras:
-            label += " [DETECTED ✓]"
-        choices.append(
-            questionary.Choice(
-                title=label,
-                value=integration,
-                checked=integration.extra in detected_extras,
-            )
-        )
+    choices = _integration_choices(_OTHER_INTEGRATIONS_SORTED, detected_extras)
 
     selected = questionary.checkbox(
         "Select integrations:",
         choices=choices,
-        style=LOGFIRE_CHECKBOX_STYLE,
+        style=_checkbox_style(),
     ).ask()
 
     # Handle Ctrl+C
@@ -172,6 +208,8 @@ def prompt_integration_selection(
 
 def display_selected_integrations(selected_integrations: list[Integration]):
     """Display summary of selected integrations."""
+    console = get_console()
+
     if not selected_integrations:
         console.print("[yellow]No integrations selected.[/yellow]")
         return
@@ -184,21 +222,45 @@ def display_selected_integrations(selected_integrations: list[Integration]):
     console.print()
 
 
+def _preview_lines(text: str, max_lines: int) -> str:
+    """Return the first max_lines lines of text, noting how many were left out."""
+    # Find the newline ending the last previewed line without splitting the whole text
+    end = -1
+    for _ in range(max_lines):
+        end = text.find("\n", end + 1)
+        if end == -1:
+            return text
+
+    remaining = text.count("\n", end + 1) + 1
+    return f"{text[:end]}\n\n... ({remaining} more lines)"
+
+
 def prompt_agents_md_addition(
     selected_integrations: list[Integration],
     project_dir: Path,
     mcp_configured: bool = False,
-) -> bool:
-    """Prompt user to add instructions to AGENTS.md/CLAUDE.md."""
+) -> tuple[bool, str]:
+    """
+    Prompt user to add instructions to AGENTS.md/CLAUDE.md.
+
+    Returns:
+        Tuple of (confirmed, instructions) so the previewed text can be written as-is.
+    """
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    console = get_console()
+
     console.print("\n[bold]Logfire Usage Instructions[/bold]")
 
     # Check for existing file
     existing_file = find_agent_config_file(project_dir)
 
     if existing_file:
-        # Show absolute path if it's outside the project
-        display_path = existing_file
-        if not str(existing_file).startswith(str(project_dir)):
+        # Show the real path if the file, or a directory above it (e.g. a
+        # symlinked .claude), points outside the project
+        display_path = Path(os.path.realpath(existing_file))
+        if not str(display_path).startswith(os.path.realpath(project_dir)):
             console.print(f"\n[dim]Found: {display_path} (outside project)[/dim]")
         else:
             console.print(f"\n[dim]Found: {display_path.name}[/dim]")
@@ -214,12 +276,7 @@ def prompt_agents_md_addition(
     console.print("\n[bold]Preview of instructions to be added:[/bold]\n")
 
     # Show first 30 lines
-    lines = instructions.split("\n")
-    preview_lines = lines[:30]
-    preview_text = "\n".join(preview_lines)
-
-    if len(lines) > 30:
-        preview_text += f"\n\n... ({len(lines) - 30} more lines)"
+    preview_text = _preview_lines(instructions, 30)
 
     console.print(Panel(preview_text, border_style="dim", expand=False))
 
@@ -230,11 +287,13 @@ def prompt_agents_md_addition(
     else:
         question = "Create AGENTS.md with these instructions?"
 
-    return Confirm.ask(question, default=False)
+    return Confirm.ask(question, default=False), instructions
 
 
-def check_and_display_auth() -> bool:
+def check_and_display_auth(project_dir: Path) -> bool:
     """Check authentication status and display result."""
+    console = get_console()
+
     console.print("[bold]Checking authentication...[/bold]")
     auth_status = check_authentication()
 
@@ -245,7 +304,7 @@ def check_and_display_auth() -> bool:
         console.print(
             f"[yellow]⚠[/yellow] {auth_status.message}. Checking for token...\n"
         )
-        token_status = check_env_token()
+        token_status = check_env_token(project_dir)
         if token_status.is_authenticated:
             console.print(f"[green]✓[/green] {token_status.message}\n")
             return True
@@ -254,32 +313,50 @@ def check_and_display_auth() -> bool:
         return False
 
 
-def check_existing_credentials() -> str | None:
+@lru_cache(maxsize=4)
+def _read_credentials(path: str, mtime_ns: int) -> str | None:
+    """Read project_url from a credentials file, cached until its mtime changes."""
+    import json
+
+    try:
+        data = json.loads(Path(path).read_bytes())
+        project_url = data.get("project_url")
+        if project_url:
+            return project_url
+    except Exception:
+        pass
+
+    return None
+
+
+def check_existing_credentials(project_dir: Path) -> str | None:
     """
     Check for existing logfire credentials and return project_url if valid.
 
+    Args:
+        project_dir: Project directory containing the .logfire directory.
+
     Returns:
         project_url if valid credentials exist, None otherwise.
     """
-    credentials_file = Path.cwd() / ".logfire" / "logfire_credentials.json"
-
-    if not credentials_file.exists():
-        return None
+    credentials_file = project_dir / ".logfire" / "logfire_credentials.json"
 
     try:
-        with open(credentials_file) as f:
-            data = json.load(f)
-            project_url = data.get("project_url")
-            if project_url:
-                return project_url
-    except (json.JSONDecodeError, FileNotFoundError, Exception):
-        pass
+        mtime_ns = os.stat(credentials_file).st_mtime_ns
+    except OSError:
+        return None
 
-    return None
+    return _read_credentials(str(credentials_file), mtime_ns)
 
 
-def prompt_project_selection() -> str | None:
+def prompt_project_selection(state: RunState, project_dir: Path) -> str | None:
     """Fetch and prompt user to select a Logfire project."""
+    import subprocess
+
+    import questionary
+
+    console = get_console()
+
     console.print("[bold]Fetching your Logfire projects...[/bold]")
 
     projects = fetch_user_projects()
@@ -319,7 +396,7 @@ def prompt_project_selection() -> str | None:
     selected_project = questionary.select(
         "Select a project:",
         choices=choices,
-        style=LOGFIRE_CHECKBOX_STYLE,
+        style=_checkbox_style(),
     ).ask()
 
     # Handle Ctrl+C
@@ -338,22 +415,23 @@ def prompt_project_selection() -> str | None:
     # Run logfire projects use to create .logfire directory
     console.print(f"[dim]Setting project to {project_name}...[/dim]")
     try:
+        # Output is only read on failure, so keep it as bytes and decode lazily
         subprocess.run(
-            ["logfire", "projects", "use", project_name],
+            ("logfire", "projects", "use", project_name),
+            cwd=project_dir,
             check=True,
             capture_output=True,
-            text=True,
         )
 
         # Read project_url from logfire_credentials.json
-        global project_url
-        project_url = check_existing_credentials()
-        if project_url:
+        state.project_url = check_existing_credentials(project_dir)
+        if state.project_url:
             console.print("[green]✓[/green] Project configured\n")
         else:
             console.print("[yellow]⚠[/yellow] Could not find credentials file\n")
     except subprocess.CalledProcessError as e:
-        console.print(f"[yellow]⚠[/yellow] Failed to set project: {e.stderr}\n")
+        stderr = e.stderr.decode("utf-8", "replace")
+        console.print(f"[yellow]⚠[/yellow] Failed to set project: {stderr}\n")
     except FileNotFoundError as e:
         console.print(f"[yellow]⚠[/yellow] Error reading credentials: {e}\n")
     except Exception as e:
@@ -362,17 +440,24 @@ def prompt_project_selection() -> str | None:
     return project_path
 
 
-def check_and_display_mcp() -> bool:
+def check_and_display_mcp(state: RunState, project_dir: Path) -> bool:
     """
     Check for MCP configuration and display status.
 
+    Args:
+        state: Run state; its project_url is used to link to read token creation.
+        project_dir: Project directory to search for MCP configuration.
+
     Returns:
         True if MCP is configured with read token, False otherwise.
     """
-    global project_url
+    from rich.panel import Panel
+
+    console = get_console()
+
     console.print("\n[bold]Checking MCP configuration...[/bold]")
 
-    mcp_config_check = find_mcp_config()
+    mcp_config_check = find_mcp_config(project_dir)
 
     if mcp_config_check.is_configured and mcp_config_check.has_read_token:
         console.print(
@@ -383,8 +468,8 @@ def check_and_display_mcp() -> bool:
         console.print(
             f"[yellow]⚠[/yellow] MCP configured in {mcp_config_check.config_file_path} but missing LOGFIRE_READ_TOKEN"
         )
-        if project_url:
-            read_url = get_read_token_url(project_url)
+        if state.project_url:
+            read_url = get_read_token_url(state.project_url)
             if read_url:
                 console.print(f"[dim]Create a read token at: {read_url}[/dim]")
         return False
@@ -395,16 +480,16 @@ def check_and_display_mcp() -> bool:
         )
 
         # Try to detect IDE from config file locations
-        cursor_config = Path.cwd() / ".cursor" / "mcp.json"
-        if cursor_config.exists() or cursor_config.parent.exists():
-            example = get_mcp_config_example("cursor")
-            console.print(Panel(example, title=".cursor/mcp.json", border_style="dim"))
+        # (.cursor/mcp.json can only exist if the .cursor directory does)
+        if os.path.isdir(project_dir / ".cursor"):
+            title = ".cursor/mcp.json"
         else:
-            example = get_mcp_config_example("cursor")
-            console.print(Panel(example, title="Example config", border_style="dim"))
+            title = "Example config"
+        example = get_mcp_config_example("cursor")
+        console.print(Panel(example, title=title, border_style="dim"))
 
-        if project_url:
-            read_token_url = get_read_token_url(project_url)
+        if state.project_url:
+            read_token_url = get_read_token_url(state.project_url)
             if read_token_url:
                 console.print(f"\n[dim]Create a read token at: {read_token_url}[/dim]")
 
@@ -413,6 +498,10 @@ def check_and_display_mcp() -> bool:
 
 def main():
     """Main CLI entry point."""
+    from rich.prompt import Confirm
+
+    console = get_console()
+
     try:
         # Welcome
         print_welcome()
@@ -425,12 +514,13 @@ def main():
             console.print("\nPlease install uv from: https://docs.astral.sh/uv/")
             sys.exit(1)
 
-        # Get project directory
+        # Get project directory once and pass it to every step
         project_dir = Path.cwd()
+        state = RunState()
         console.print(f"[dim]Project directory: {project_dir}[/dim]\n")
 
         # Check authentication
-        is_authenticated = check_and_display_auth()
+        is_authenticated = check_and_display_auth(project_dir)
         if not is_authenticated:
             console.print(
                 "[bold]To authenticate, run:[/bold]uv add logfire && logfire auth\n"
@@ -441,17 +531,16 @@ def main():
         # Project selection (if authenticated)
         if is_authenticated:
             # Check for existing credentials first
-            existing_project_url = check_existing_credentials()
+            existing_project_url = check_existing_credentials(project_dir)
             if existing_project_url:
-                global project_url
-                project_url = existing_project_url
+                state.project_url = existing_project_url
                 console.print(
                     "[green]✓[/green] Found existing project configuration\n"
                 )
-                console.print(f"[dim]Project URL: {project_url}[/dim]\n")
-                project_path = project_url  # Use URL as path identifier
+                console.print(f"[dim]Project URL: {state.project_url}[/dim]\n")
+                project_path = state.project_url  # Use URL as path identifier
             else:
-                project_path = prompt_project_selection()
+                project_path = prompt_project_selection(state, project_dir)
         else:
             project_path = None
 
@@ -497,7 +586,9 @@ def main():
             sys.exit(1)
 
         # Check MCP configuration
-        mcp_configured = check_and_display_mcp()
+        mcp_configured = check_and_display_mcp(state, project_dir)
+
+        import questionary
 
         questionary.press_any_key_to_continue().ask()
 
@@ -506,14 +597,11 @@ def main():
             "\nWould you like to add Logfire usage instructions for AI assistants?",
             default=True,
         ):
-            add_instructions = prompt_agents_md_addition(
+            add_instructions, instructions = prompt_agents_md_addition(
                 selected_integrations, project_dir, mcp_configured
             )
 
             if add_instructions:
-                instructions = generate_instructions(
-                    selected_integrations, mcp_configured
-                )
                 success, file_path = add_instructions_to_project(
                     instructions, project_dir
                 )
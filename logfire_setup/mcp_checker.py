@@ -1,11 +1,13 @@
 """Check for MCP (Model Context Protocol) configuration."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
 
 
-@dataclass
+@dataclass(frozen=True)
 class McpConfigCheckResult:
     is_configured: bool
     config_file_path: Path | None
@@ -27,80 +29,156 @@ def get_read_token_url(project_url: str | None) -> str | None:
     return f"{project_url}/settings/read-tokens/new"
 
 
-def find_mcp_config() -> McpConfigCheckResult:
+# MCP config file locations relative to the project, in priority order
+_PROJECT_REL_PATHS: tuple[tuple[str, ...], ...] = (
+    (".mcp.json",),
+    (".cursor", "mcp.json"),
+    ("cline_mcp_settings.json",),
+    (".claude", "mcp.json"),
+    (".vscode", "mcp.json"),
+    (".zed", "settings.json"),
+)
+
+# Claude Desktop's config location relative to the home directory
+_HOME_REL_PATH = (
+    "Library",
+    "Application Support",
+    "Claude",
+    "claude_desktop_config.json",
+)
+
+# Keys holding the server table, by IDE config format
+_SERVER_KEYS = ("mcpServers", "servers", "context_servers")
+
+# Substrings in a server's args that mean a read token is passed
+_TOKEN_MARKERS = ("--read-token", "LOGFIRE_READ_TOKEN")
+
+# Config directories found missing, so later calls in the same run skip them.
+# Reset whenever a different project directory is searched.
+_missing_parents: set[Path] = set()
+_last_project_dir: Path | None = None
+
+
+def _list_dir(directory: Path) -> frozenset[str]:
+    """List the entry names of a directory with a single scandir."""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        _missing_parents.add(directory)
+    except OSError:
+        pass
+    return frozenset()
+
+
+def _find_mcp_config_uncached(project_dir: Path, home: Path) -> McpConfigCheckResult:
     """
-    Check for MCP configuration files and Logfire setup.
+    Check for MCP configuration files under a project and home directory.
+
+    Args:
+        project_dir: Project directory to search.
+        home: Home directory holding user-level configs (Claude Desktop).
 
     Returns:
-        Tuple of (is_configured, config_file_path, has_read_token)
+        McpConfigCheckResult for the first config that sets up the Logfire server.
     """
+    global _last_project_dir
+    if project_dir != _last_project_dir:
+        _missing_parents.clear()
+        _last_project_dir = project_dir
+
     # Check common MCP config file locations
-    config_locations = [
-        Path.cwd() / ".mcp.json",
-        Path.cwd() / ".cursor" / "mcp.json",
-        Path.cwd() / "cline_mcp_settings.json",
-        Path.cwd() / ".claude" / "mcp.json",
-        Path.cwd() / ".vscode" / "mcp.json",
-        Path.cwd() / ".zed" / "settings.json",
-        Path.home() / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json",
-    ]
+    config_locations = [Path(project_dir, *rel) for rel in _PROJECT_REL_PATHS]
+    config_locations.append(Path(home, *_HOME_REL_PATH))
 
+    # Several candidates share a parent, so list each parent once instead of
+    # stat'ing every candidate
+    listings: dict[Path, frozenset[str]] = {}
     for config_path in config_locations:
-        if not config_path.exists():
+        parent = config_path.parent
+        if parent in _missing_parents:
+            continue
+        names = listings.get(parent)
+        if names is None:
+            # A config dir absent from an already-listed project dir is missing
+            # (.cursor, .claude, ... usually are), so it needs no scandir
+            grandparent_names = listings.get(parent.parent)
+            if grandparent_names is not None and parent.name not in grandparent_names:
+                _missing_parents.add(parent)
+                continue
+            names = listings[parent] = _list_dir(parent)
+        if config_path.name not in names:
             continue
 
+        # read_bytes closes the file before parsing
         try:
-            with open(config_path) as f:
-                config = json.load(f)
-
-            # Check different JSON structures based on IDE
-            # Standard: mcpServers (Cursor, Cline, Claude Desktop, Claude Code)
-            # VS Code: servers
-            # Zed: context_servers
-            logfire_config = None
-            for key in ["mcpServers", "servers", "context_servers"]:
-                servers = config.get(key, {})
-                if "logfire" in servers:
-                    logfire_config = servers["logfire"]
-                    break
-
-            if logfire_config:
-                # Check if read token is present (in args or env)
-                has_token = False
-
-                # Check in args
-                args = logfire_config.get("args", [])
-                if any(
-                    "--read-token" in str(arg) or "LOGFIRE_READ_TOKEN" in str(arg)
-                    for arg in args
-                ):
-                    has_token = True
-
-                # Check in env
-                env = logfire_config.get("env", {})
-                if "LOGFIRE_READ_TOKEN" in env:
-                    has_token = True
-
-                return McpConfigCheckResult(True, config_path, has_token)
-
-        except (json.JSONDecodeError, Exception):
+            config = json.loads(config_path.read_bytes())
+        except (OSError, ValueError):
+            continue
+        if not isinstance(config, dict):
             continue
 
+        # Check different JSON structures based on IDE
+        # Standard: mcpServers (Cursor, Cline, Claude Desktop, Claude Code)
+        # VS Code: servers
+        # Zed: context_servers
+        logfire_config = next(
+            (
+                servers["logfire"]
+                for servers in map(config.get, _SERVER_KEYS)
+                if isinstance(servers, dict) and "logfire" in servers
+            ),
+            None,
+        )
+
+        if isinstance(logfire_config, dict) and logfire_config:
+            # Treat malformed args or env (e.g. null) as empty
+            args = logfire_config.get("args")
+            args = args if isinstance(args, list) else []
+            env = logfire_config.get("env")
+            env = env if isinstance(env, dict) else {}
+
+            # Check if read token is present (in args or env)
+            has_token = "LOGFIRE_READ_TOKEN" in env or any(
+                isinstance(arg, str) and any(marker in arg for marker in _TOKEN_MARKERS)
+                for arg in args
+            )
+
+            return McpConfigCheckResult(True, config_path, has_token)
+
     return McpConfigCheckResult(False, None, False)
 
 
-def get_mcp_config_example(ide_name: str = "cursor") -> str:
+_find_mcp_config_cached = lru_cache(maxsize=8)(_find_mcp_config_uncached)
+
+
+def find_mcp_config(project_dir: Path | None = None) -> McpConfigCheckResult:
     """
-    Get MCP configuration example for a specific IDE.
+    Check for MCP configuration files and Logfire setup.
+
+    Results are cached per project and home directory; call
+    clear_mcp_config_cache() after changing config files.
 
     Args:
-        ide_name: IDE name (cursor, claude-desktop, cline, claude-code)
+        project_dir: Project directory to search. Defaults to current directory.
 
     Returns:
-        JSON configuration example as string
+        McpConfigCheckResult with is_configured, config_file_path, has_read_token.
     """
-    examples = {
-        "cursor": """{
+    if project_dir is None:
+        project_dir = Path.cwd()
+    return _find_mcp_config_cached(project_dir, Path.home())
+
+
+def clear_mcp_config_cache() -> None:
+    """Forget cached find_mcp_config results and directories found missing."""
+    _find_mcp_config_cached.cache_clear()
+    _missing_parents.clear()
+
+
+# Example MCP server config for each IDE, by IDE name
+_MCP_EXAMPLES: dict[str, str] = {
+    "cursor": """{
   "mcpServers": {
     "logfire": {
       "command": "uvx",
@@ -108,7 +186,7 @@ def get_mcp_config_example(ide_name: str = "cursor") -> str:
     }
   }
 }""",
-        "claude-desktop": """{
+    "claude-desktop": """{
   "mcpServers": {
     "logfire": {
       "command": ["uvx"],
@@ -120,7 +198,7 @@ def get_mcp_config_example(ide_name: str = "cursor") -> str:
     }
   }
 }""",
-        "cline": """{
+    "cline": """{
   "mcpServers": {
     "logfire": {
       "command": "uvx",
@@ -133,8 +211,8 @@ def get_mcp_config_example(ide_name: str = "cursor") -> str:
     }
   }
 }""",
-        "claude-code": """Run: claude mcp add logfire -e LOGFIRE_READ_TOKEN=YOUR_TOKEN -- uvx logfire-mcp@latest""",
-        "vs-code": """{
+    "claude-code": """Run: claude mcp add logfire -e LOGFIRE_READ_TOKEN=YOUR_TOKEN -- uvx logfire-mcp@latest""",
+    "vs-code": """{
   "servers": {
     "logfire": {
       "type": "stdio",
@@ -146,7 +224,7 @@ def get_mcp_config_example(ide_name: str = "cursor") -> str:
     }
   }
 }""",
-        "zed": """{
+    "zed": """{
   "context_servers": {
     "logfire": {
       "source": "custom",
@@ -159,6 +237,17 @@ def get_mcp_config_example(ide_name: str = "cursor") -> str:
     }
   }
 }""",
-    }
+}
 
-    return examples.get(ide_name, examples["cursor"])
+
+def get_mcp_config_example(ide_name: str = "cursor") -> str:
+    """
+    Get MCP configuration example for a specific IDE.
+
+    Args:
+        ide_name: IDE name (cursor, claude-desktop, cline, claude-code)
+
+    Returns:
+        JSON configuration example as string
+    """
+    return _MCP_EXAMPLES.get(ide_name, _MCP_EXAMPLES["cursor"])
@@ -3,12 +3,12 @@
 import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 from logfire_setup.agents_md import (
     add_instructions_to_project,
     check_if_logfire_instructions_exist,
     find_agent_config_file,
-    resolve_real_file,
 )
 
 
@@ -19,14 +19,9 @@ def test_find_agent_config_file_agents_md():
         agents_md = tmpdir / "AGENTS.md"
         agents_md.write_text("# Agents")
 
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            found = find_agent_config_file()
-            assert found is not None
-            assert found.resolve() == agents_md.resolve()
-        finally:
-            os.chdir(original_cwd)
+        found = find_agent_config_file(tmpdir)
+        assert found is not None
+        assert os.path.samefile(found, agents_md)
 
 
 def test_find_agent_config_file_claude_md():
@@ -36,26 +31,72 @@ def test_find_agent_config_file_claude_md():
         claude_md = tmpdir / "CLAUDE.md"
         claude_md.write_text("# Claude")
 
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            found = find_agent_config_file()
+        found = find_agent_config_file(tmpdir)
+        assert found is not None
+        assert os.path.samefile(found, claude_md)
+
+
+def test_find_agent_config_file_ignores_case():
+    """Test a lowercase agents.md is used, not overwritten, if the FS ignores case."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        agents_md = tmpdir / "agents.md"
+        agents_md.write_text("# Agents")
+        case_insensitive = (tmpdir / "AGENTS.md").exists()
+
+        found = find_agent_config_file(tmpdir)
+        if case_insensitive:
             assert found is not None
-            assert found.resolve() == claude_md.resolve()
-        finally:
-            os.chdir(original_cwd)
+            assert os.path.samefile(found, agents_md)
+        else:
+            assert found is None
+
+        # Simulate a case-insensitive filesystem resolving AGENTS.md
+        with mock.patch("os.path.isfile", return_value=True):
+            found = find_agent_config_file(tmpdir)
+        assert found is not None
+        assert found.name == "agents.md"
+
+        success, file_path = add_instructions_to_project("# New", tmpdir)
+        assert success is True
+        assert file_path is not None
+        assert agents_md.read_text().startswith("# Agents")
+
+
+def test_find_agent_config_file_exact_name_before_case_variant():
+    """Test an unrelated agents.md doesn't shadow CLAUDE.md on a case-sensitive FS."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        agents_md = tmpdir / "agents.md"
+        agents_md.write_text("# Notes")
+        claude_md = tmpdir / "CLAUDE.md"
+        claude_md.write_text("# Claude")
+        case_insensitive = (tmpdir / "AGENTS.md").exists()
+
+        found = find_agent_config_file(tmpdir)
+        assert found is not None
+        assert os.path.samefile(found, agents_md if case_insensitive else claude_md)
 
 
 def test_find_agent_config_file_not_found():
     """Test when no config file exists."""
     with TemporaryDirectory() as tmpdir:
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            found = find_agent_config_file()
-            assert found is None
-        finally:
-            os.chdir(original_cwd)
+        found = find_agent_config_file(Path(tmpdir))
+        assert found is None
+
+
+def test_find_agent_config_file_in_claude_dir():
+    """Test finding CLAUDE.md inside the .claude directory."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        claude_dir = tmpdir / ".claude"
+        claude_dir.mkdir()
+        claude_md = claude_dir / "CLAUDE.md"
+        claude_md.write_text("# Claude")
+
+        found = find_agent_config_file(tmpdir)
+        assert found is not None
+        assert os.path.samefile(found, claude_md)
 
 
 def test_check_if_logfire_instructions_exist_true():
@@ -69,6 +110,30 @@ def test_check_if_logfire_instructions_exist_true():
         assert exists is True
 
 
+def test_check_if_logfire_instructions_exist_other_markers():
+    """Test detecting Logfire instructions by configure call or docs URL."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        agents_md = tmpdir / "AGENTS.md"
+
+        agents_md.write_text("# Project\n\nCall logfire.configure() at startup.")
+        assert check_if_logfire_instructions_exist(agents_md) is True
+
+        agents_md.write_text("# Project\n\nSee https://logfire.pydantic.dev/docs/")
+        assert check_if_logfire_instructions_exist(agents_md) is True
+
+
+def test_check_if_logfire_instructions_exist_large_file():
+    """Test detecting a marker that straddles a read block boundary."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        agents_md = tmpdir / "AGENTS.md"
+        padding = "x" * (64 * 1024 - 5)
+        agents_md.write_text(padding + "# Logfire Best Practices\n")
+
+        assert check_if_logfire_instructions_exist(agents_md) is True
+
+
 def test_check_if_logfire_instructions_exist_false():
     """Test when Logfire instructions don't exist."""
     with TemporaryDirectory() as tmpdir:
@@ -85,20 +150,14 @@ def test_add_instructions_create_new():
     with TemporaryDirectory() as tmpdir:
         tmpdir = Path(tmpdir)
 
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-
-            instructions = "# Test Instructions\n\nTest content"
-            success, file_path = add_instructions_to_project(instructions)
+        instructions = "# Test Instructions\n\nTest content"
+        success, file_path = add_instructions_to_project(instructions, tmpdir)
 
-            assert success is True
-            assert file_path is not None
-            assert file_path.resolve() == (tmpdir / "AGENTS.md").resolve()
-            assert file_path.exists()
-            assert "Test Instructions" in file_path.read_text()
-        finally:
-            os.chdir(original_cwd)
+        assert success is True
+        assert file_path is not None
+        assert os.path.samefile(file_path, tmpdir / "AGENTS.md")
+        assert file_path.exists()
+        assert "Test Instructions" in file_path.read_text()
 
 
 def test_add_instructions_append_existing():
@@ -108,22 +167,16 @@ def test_add_instructions_append_existing():
         agents_md = tmpdir / "AGENTS.md"
         agents_md.write_text("# Existing content")
 
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
+        instructions = "# New Instructions"
+        success, file_path = add_instructions_to_project(instructions, tmpdir)
 
-            instructions = "# New Instructions"
-            success, file_path = add_instructions_to_project(instructions)
-
-            assert success is True
-            assert file_path is not None
-            assert file_path.resolve() == agents_md.resolve()
-            content = file_path.read_text()
-            assert "Existing content" in content
-            assert "New Instructions" in content
-            assert "---" in content  # Separator
-        finally:
-            os.chdir(original_cwd)
+        assert success is True
+        assert file_path is not None
+        assert os.path.samefile(file_path, agents_md)
+        content = file_path.read_text()
+        assert "Existing content" in content
+        assert "New Instructions" in content
+        assert "---" in content  # Separator
 
 
 def test_add_instructions_skip_if_exists():
@@ -133,28 +186,22 @@ def test_add_instructions_skip_if_exists():
         agents_md = tmpdir / "AGENTS.md"
         agents_md.write_text("# Logfire Best Practices\n\nExisting logfire content")
 
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-
-            instructions = "# Logfire Best Practices\n\nNew content"
-            success, file_path = add_instructions_to_project(instructions)
+        instructions = "# Logfire Best Practices\n\nNew content"
+        success, file_path = add_instructions_to_project(instructions, tmpdir)
 
-            # Should succeed but not modify
-            assert success is True
-            assert file_path is not None
-            assert file_path.resolve() == agents_md.resolve()
-            # Content should be unchanged
-            assert (
-                file_path.read_text()
-                == "# Logfire Best Practices\n\nExisting logfire content"
-            )
-        finally:
-            os.chdir(original_cwd)
+        # Should succeed but not modify
+        assert success is True
+        assert file_path is not None
+        assert os.path.samefile(file_path, agents_md)
+        # Content should be unchanged
+        assert (
+            file_path.read_text()
+            == "# Logfire Best Practices\n\nExisting logfire content"
+        )
 
 
-def test_resolve_real_file():
-    """Test symlink resolution."""
+def test_add_instructions_through_symlink():
+    """Test appending to a symlinked AGENTS.md writes to the real file."""
     with TemporaryDirectory() as tmpdir:
         tmpdir = Path(tmpdir)
 
@@ -163,11 +210,19 @@ def test_resolve_real_file():
         real_file.write_text("Real content")
 
         # Create a symlink
-        symlink = tmpdir / "symlink.md"
+        project_dir = tmpdir / "project"
+        project_dir.mkdir()
+        symlink = project_dir / "AGENTS.md"
         symlink.symlink_to(real_file)
 
-        resolved = resolve_real_file(symlink)
-        assert resolved == real_file.resolve()
+        success, file_path = add_instructions_to_project(
+            "# New Instructions", project_dir
+        )
+
+        assert success is True
+        assert file_path == symlink
+        assert symlink.is_symlink()
+        assert "New Instructions" in real_file.read_text()
 
 
 if __name__ == "__main__":
@@ -177,12 +232,27 @@ if __name__ == "__main__":
     test_find_agent_config_file_claude_md()
     print("✓ test_find_agent_config_file_claude_md")
 
+    test_find_agent_config_file_ignores_case()
+    print("✓ test_find_agent_config_file_ignores_case")
+
+    test_find_agent_config_file_exact_name_before_case_variant()
+    print("✓ test_find_agent_config_file_exact_name_before_case_variant")
+
     test_find_agent_config_file_not_found()
     print("✓ test_find_agent_config_file_not_found")
 
+    test_find_agent_config_file_in_claude_dir()
+    print("✓ test_find_agent_config_file_in_claude_dir")
+
     test_check_if_logfire_instructions_exist_true()
     print("✓ test_check_if_logfire_instructions_exist_true")
 
+    test_check_if_logfire_instructions_exist_other_markers()
+    print("✓ test_check_if_logfire_instructions_exist_other_markers")
+
+    test_check_if_logfire_instructions_exist_large_file()
+    print("✓ test_check_if_logfire_instructions_exist_large_file")
+
     test_check_if_logfire_instructions_exist_false()
     print("✓ test_check_if_logfire_instructions_exist_false")
 
@@ -195,7 +265,7 @@ if __name__ == "__main__":
     test_add_instructions_skip_if_exists()
     print("✓ test_add_instructions_skip_if_exists")
 
-    test_resolve_real_file()
-    print("✓ test_resolve_real_file")
+    test_add_instructions_through_symlink()
+    print("✓ test_add_instructions_through_symlink")
 
     print("\nAll agents_md tests passed!")
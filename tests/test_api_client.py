@@ -1,5 +1,7 @@
 """Tests for API client."""
 
+import subprocess
+import sys
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest import mock
@@ -48,7 +50,7 @@ def test_fetch_user_projects_success():
         "logfire_setup.api_client.get_user_token",
         return_value=("token", "https://logfire-us.pydantic.dev"),
     ):
-        with mock.patch("logfire_setup.api_client.httpx.get") as mock_get:
+        with mock.patch("httpx.get") as mock_get:
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_projects
 
@@ -73,13 +75,20 @@ def test_fetch_user_projects_api_error():
         "logfire_setup.api_client.get_user_token",
         return_value=("token", "https://logfire-us.pydantic.dev"),
     ):
-        with mock.patch("logfire_setup.api_client.httpx.get") as mock_get:
+        with mock.patch("httpx.get") as mock_get:
             mock_get.return_value.status_code = 401
 
             projects = fetch_user_projects()
             assert projects is None
 
 
+def test_import_does_not_load_httpx():
+    """Test importing the client leaves httpx unloaded until a fetch."""
+    code = "import sys, logfire_setup.api_client; sys.exit('httpx' in sys.modules)"
+    result = subprocess.run((sys.executable, "-c", code))
+    assert result.returncode == 0
+
+
 if __name__ == "__main__":
     test_get_user_token_no_file()
     print("✓ test_get_user_token_no_file")
@@ -96,4 +105,7 @@ if __name__ == "__main__":
     test_fetch_user_projects_api_error()
     print("✓ test_fetch_user_projects_api_error")
 
+    test_import_does_not_load_httpx()
+    print("✓ test_import_does_not_load_httpx")
+
     print("\nAll api_client tests passed!")
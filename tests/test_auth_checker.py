@@ -3,8 +3,13 @@
 import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
-from logfire_setup.auth_checker import check_authentication, check_env_token
+from logfire_setup.auth_checker import (
+    check_authentication,
+    check_env_token,
+    load_default_toml,
+)
 
 
 def test_check_authentication_no_file():
@@ -17,6 +22,39 @@ def test_check_authentication_no_file():
     assert isinstance(auth_status.message, str)
 
 
+def test_check_authentication_token_expiration():
+    """Test valid and expired tokens in default.toml."""
+    with TemporaryDirectory() as tmpdir:
+        fake_home = Path(tmpdir)
+        logfire_dir = fake_home / ".logfire"
+        logfire_dir.mkdir()
+        default_file = logfire_dir / "default.toml"
+
+        with mock.patch("pathlib.Path.home", return_value=fake_home):
+            default_file.write_text("""
+[tokens."https://logfire-eu.pydantic.dev"]
+token = "expired_token"
+expiration = "2000-01-01T00:00:00Z"
+
+[tokens."https://logfire-us.pydantic.dev"]
+token = "test_token_123"
+expiration = "2099-12-31T23:59:59.123456"
+""")
+            auth_status = check_authentication()
+            assert auth_status.is_authenticated is True
+            assert auth_status.base_url == "https://logfire-us.pydantic.dev"
+
+            default_file.write_text("""
+[tokens."https://logfire-us.pydantic.dev"]
+token = "expired_token"
+expiration = "2000-01-01T00:00:00Z"
+""")
+            os.utime(default_file, ns=(1_000_000_000, 1_000_000_000))
+            auth_status = check_authentication()
+            assert auth_status.is_authenticated is False
+            assert "expired" in auth_status.message
+
+
 def test_check_env_token_in_environment():
     """Test env token detection in environment variables."""
     # Save original
@@ -39,51 +77,80 @@ def test_check_env_token_in_environment():
 def test_check_env_token_in_dotenv():
     """Test env token detection in .env file."""
     with TemporaryDirectory() as tmpdir:
-        # Change to temp directory
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
+        # Create .env file
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text("LOGFIRE_TOKEN=test_token_value\n")
 
-            # Create .env file
-            env_file = Path(tmpdir) / ".env"
-            env_file.write_text("LOGFIRE_TOKEN=test_token_value\n")
+        # Make sure not in environment
+        os.environ.pop("LOGFIRE_TOKEN", None)
 
-            # Make sure not in environment
-            os.environ.pop("LOGFIRE_TOKEN", None)
+        token_status = check_env_token(Path(tmpdir))
+        assert token_status.is_authenticated is True
+        assert ".env" in token_status.message
+
+
+def test_check_env_token_in_dotenv_later_line():
+    """Test an indented token line after other entries is detected, not a comment."""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text("# LOGFIRE_TOKEN=old\nOTHER=1\n\n  LOGFIRE_TOKEN=abc\n")
+        os.environ.pop("LOGFIRE_TOKEN", None)
+
+        assert check_env_token(Path(tmpdir)).is_authenticated is True
 
-            token_status = check_env_token()
-            assert token_status.is_authenticated is True
-            assert ".env" in token_status.message
-        finally:
-            os.chdir(original_cwd)
+        env_file.write_text("# LOGFIRE_TOKEN=old\nMY_LOGFIRE_TOKEN=abc\n")
+        assert check_env_token(Path(tmpdir)).is_authenticated is False
 
 
 def test_check_env_token_missing():
     """Test env token detection when token is missing."""
     with TemporaryDirectory() as tmpdir:
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            # Make sure not in environment
-            os.environ.pop("LOGFIRE_TOKEN", None)
+        # Make sure not in environment
+        os.environ.pop("LOGFIRE_TOKEN", None)
+
+        token_status = check_env_token(Path(tmpdir))
+        assert token_status.is_authenticated is False
+
+
+def test_load_default_toml_reloads_on_change():
+    """Test the cached default.toml is re-read when the file changes."""
+    with TemporaryDirectory() as tmpdir:
+        default_file = Path(tmpdir) / "default.toml"
+        assert load_default_toml(default_file) is None
 
-            token_status = check_env_token()
-            assert token_status.is_authenticated is False
-        finally:
-            os.chdir(original_cwd)
+        default_file.write_text('[tokens."https://a"]\ntoken = "first"\n')
+        os.utime(default_file, ns=(1_000_000_000, 1_000_000_000))
+        data = load_default_toml(default_file)
+        assert data is not None
+        assert data["tokens"]["https://a"]["token"] == "first"
+
+        default_file.write_text('[tokens."https://a"]\ntoken = "second"\n')
+        os.utime(default_file, ns=(2_000_000_000, 2_000_000_000))
+        data = load_default_toml(default_file)
+        assert data is not None
+        assert data["tokens"]["https://a"]["token"] == "second"
 
 
 if __name__ == "__main__":
     test_check_authentication_no_file()
     print("✓ test_check_authentication_no_file")
 
+    test_check_authentication_token_expiration()
+    print("✓ test_check_authentication_token_expiration")
+
     test_check_env_token_in_environment()
     print("✓ test_check_env_token_in_environment")
 
     test_check_env_token_in_dotenv()
     print("✓ test_check_env_token_in_dotenv")
 
+    test_check_env_token_in_dotenv_later_line()
+    print("✓ test_check_env_token_in_dotenv_later_line")
+
     test_check_env_token_missing()
     print("✓ test_check_env_token_missing")
 
+    test_load_default_toml_reloads_on_change()
+    print("✓ test_load_default_toml_reloads_on_change")
+
     print("\nAll auth_checker tests passed!")
@@ -5,7 +5,10 @@ from tempfile import TemporaryDirectory
 
 from logfire_setup.detector import (
     detect_integrations,
+    detect_project_dependencies,
+    match_integrations_to_dependencies,
     parse_pyproject_toml,
+    parse_requirements_txt,
 )
 
 
@@ -28,6 +31,66 @@ dependencies = [
         assert "sqlalchemy" in packages
 
 
+def test_parse_pyproject_toml_all_sections():
+    """Test parsing dependencies from every supported pyproject.toml section."""
+    with TemporaryDirectory() as tmpdir:
+        pyproject = Path(tmpdir) / "pyproject.toml"
+        pyproject.write_text(
+            """
+[project]
+dependencies = ["fastapi>=0.100.0"]
+
+[project.optional-dependencies]
+db = ["asyncpg"]
+
+[dependency-groups]
+dev = ["pytest"]
+test = [{include-group = "dev"}, "httpx"]
+
+[tool.poetry.dependencies]
+python = "^3.11"
+Redis = "^5.0"
+"""
+        )
+
+        packages = parse_pyproject_toml(pyproject)
+        assert packages == {"fastapi", "asyncpg", "pytest", "httpx", "redis"}
+
+
+def test_parse_requirements_txt():
+    """Test parsing requirements.txt with various specifiers."""
+    with TemporaryDirectory() as tmpdir:
+        requirements = Path(tmpdir) / "requirements.txt"
+        requirements.write_text(
+            """
+# comment
+-r base.txt
+FastAPI[standard]>=0.100.0
+httpx~=0.27
+redis!=5.0.0
+celery ; python_version >= "3.9"
+@ https://example.com/not-a-name.whl
+"""
+        )
+
+        packages = parse_requirements_txt(requirements)
+        assert packages == {"fastapi", "httpx", "redis", "celery"}
+
+
+def test_detect_project_dependencies_prefers_pyproject():
+    """Test requirements.txt is only used when pyproject.toml has no dependencies."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        pyproject = tmpdir / "pyproject.toml"
+        pyproject.write_text('[project]\ndependencies = ["fastapi"]\n')
+        (tmpdir / "requirements.txt").write_text("flask\n")
+
+        assert detect_project_dependencies(tmpdir) == {"fastapi"}
+
+        pyproject.write_text('[project]\nname = "app"\n')
+        assert detect_project_dependencies(tmpdir) == {"flask"}
+
+
 def test_detect_integrations():
     """Test detecting integrations from dependencies."""
     with TemporaryDirectory() as tmpdir:
@@ -52,7 +115,20 @@ dependencies = [
         assert "redis" in extras
 
 
+def test_match_integrations_shared_pattern():
+    """Test a package pattern shared by several integrations matches all of them."""
+    integrations = match_integrations_to_dependencies({"aiohttp", "fastapi", "numpy"})
+    extras = [i.extra for i in integrations]
+
+    # Returned in category order
+    assert extras == ["fastapi", "aiohttp-client", "aiohttp-server"]
+
+
 if __name__ == "__main__":
     test_parse_pyproject_toml()
+    test_parse_pyproject_toml_all_sections()
+    test_parse_requirements_txt()
+    test_detect_project_dependencies_prefers_pyproject()
     test_detect_integrations()
+    test_match_integrations_shared_pattern()
     print("All tests passed!")
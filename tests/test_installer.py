@@ -0,0 +1,125 @@
+"""Tests for installing logfire with uv."""
+
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from logfire_setup.installer import (
+    InstallationError,
+    _uv_path,
+    check_uv_available,
+    install_logfire,
+)
+
+
+def _mock_popen(returncode: int, lines: list[str]) -> mock.MagicMock:
+    """Build a subprocess.Popen mock whose process yields lines then exits."""
+    popen = mock.MagicMock()
+    process = popen.return_value.__enter__.return_value
+    process.stdout = iter(lines)
+    process.returncode = returncode
+    return popen
+
+
+def test_install_logfire_success():
+    """Test a successful uv add with extras streams output and returns True."""
+    _uv_path.cache_clear()
+    popen = _mock_popen(0, ["Resolved 3 packages\n"])
+    with (
+        TemporaryDirectory() as tmpdir,
+        mock.patch("shutil.which", return_value="/usr/bin/uv"),
+        mock.patch("subprocess.Popen", popen),
+    ):
+        assert install_logfire(["fastapi", "httpx"], Path(tmpdir)) is True
+
+        args, kwargs = popen.call_args
+        assert args[0] == ["/usr/bin/uv", "add", "logfire[fastapi,httpx]"]
+        assert kwargs["cwd"] == Path(tmpdir)
+    _uv_path.cache_clear()
+
+
+def test_install_logfire_failure():
+    """Test a failing uv add returns False."""
+    _uv_path.cache_clear()
+    popen = _mock_popen(1, ["error: No solution found\n"])
+    with (
+        TemporaryDirectory() as tmpdir,
+        mock.patch("shutil.which", return_value="/usr/bin/uv"),
+        mock.patch("subprocess.Popen", popen),
+    ):
+        assert install_logfire([], Path(tmpdir)) is False
+        assert popen.call_args.args[0] == ["/usr/bin/uv", "add", "logfire"]
+    _uv_path.cache_clear()
+
+
+def test_install_logfire_uv_missing():
+    """Test a missing uv binary raises InstallationError without running it."""
+    _uv_path.cache_clear()
+    popen = _mock_popen(0, [])
+    with (
+        TemporaryDirectory() as tmpdir,
+        mock.patch("shutil.which", return_value=None),
+        mock.patch("subprocess.Popen", popen),
+    ):
+        assert check_uv_available() is False
+        try:
+            install_logfire([], Path(tmpdir))
+        except InstallationError:
+            pass
+        else:
+            raise AssertionError("expected InstallationError")
+        popen.assert_not_called()
+    _uv_path.cache_clear()
+
+
+def test_install_logfire_uv_removed_after_lookup():
+    """Test uv vanishing before it runs raises InstallationError and drops the cache."""
+    _uv_path.cache_clear()
+    with TemporaryDirectory() as tmpdir, mock.patch("shutil.which") as which:
+        which.return_value = str(Path(tmpdir) / "uv")
+        try:
+            install_logfire([], Path(tmpdir))
+        except InstallationError:
+            pass
+        else:
+            raise AssertionError("expected InstallationError")
+
+        # The stale path is forgotten, so the next check looks uv up again
+        check_uv_available()
+        assert which.call_count == 2
+    _uv_path.cache_clear()
+
+
+def test_install_logfire_project_dir_missing():
+    """Test a missing project directory is reported, not blamed on uv."""
+    _uv_path.cache_clear()
+    with (
+        TemporaryDirectory() as tmpdir,
+        mock.patch("shutil.which", return_value=sys.executable) as which,
+    ):
+        assert install_logfire([], Path(tmpdir) / "missing") is False
+
+        # uv is still known, so the next check doesn't look it up again
+        assert check_uv_available() is True
+        assert which.call_count == 1
+    _uv_path.cache_clear()
+
+
+if __name__ == "__main__":
+    test_install_logfire_success()
+    print("✓ test_install_logfire_success")
+
+    test_install_logfire_failure()
+    print("✓ test_install_logfire_failure")
+
+    test_install_logfire_uv_missing()
+    print("✓ test_install_logfire_uv_missing")
+
+    test_install_logfire_uv_removed_after_lookup()
+    print("✓ test_install_logfire_uv_removed_after_lookup")
+
+    test_install_logfire_project_dir_missing()
+    print("✓ test_install_logfire_project_dir_missing")
+
+    print("\nAll installer tests passed!")
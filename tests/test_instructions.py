@@ -30,7 +30,7 @@ def test_generate_core_instructions():
 def test_generate_integration_instructions_httpx():
     """Test HTTPX integration instructions with extended examples."""
     integrations = [
-        Integration("httpx", "HTTPX", "HTTPX HTTP client", ["httpx"]),
+        Integration("httpx", "HTTPX", "HTTPX HTTP client", ("httpx",)),
     ]
 
     instructions = generate_integration_instructions(integrations)
@@ -50,7 +50,7 @@ def test_generate_integration_instructions_httpx():
 def test_generate_integration_instructions_fastapi():
     """Test FastAPI integration instructions."""
     integrations = [
-        Integration("fastapi", "FastAPI", "FastAPI framework", ["fastapi"]),
+        Integration("fastapi", "FastAPI", "FastAPI framework", ("fastapi",)),
     ]
 
     instructions = generate_integration_instructions(integrations)
@@ -62,7 +62,7 @@ def test_generate_integration_instructions_fastapi():
 def test_generate_integration_instructions_llm():
     """Test LLM/AI integration instructions include pydantic-ai."""
     integrations = [
-        Integration("google-genai", "Google GenAI", "Google GenAI", ["google-genai"]),
+        Integration("google-genai", "Google GenAI", "Google GenAI", ("google-genai",)),
     ]
 
     instructions = generate_integration_instructions(integrations)
@@ -76,9 +76,9 @@ def test_generate_integration_instructions_llm():
 def test_generate_integration_instructions_multiple():
     """Test multiple integrations from different categories."""
     integrations = [
-        Integration("fastapi", "FastAPI", "FastAPI framework", ["fastapi"]),
-        Integration("httpx", "HTTPX", "HTTPX HTTP client", ["httpx"]),
-        Integration("sqlalchemy", "SQLAlchemy", "SQLAlchemy ORM", ["sqlalchemy"]),
+        Integration("fastapi", "FastAPI", "FastAPI framework", ("fastapi",)),
+        Integration("httpx", "HTTPX", "HTTPX HTTP client", ("httpx",)),
+        Integration("sqlalchemy", "SQLAlchemy", "SQLAlchemy ORM", ("sqlalchemy",)),
     ]
 
     instructions = generate_integration_instructions(integrations)
@@ -91,10 +91,22 @@ def test_generate_integration_instructions_multiple():
     assert "logfire.instrument_sqlalchemy(engine=engine)" in instructions
 
 
+def test_generate_integration_instructions_auto_instrumented():
+    """Test auto-instrumented drivers are noted by the given display name."""
+    integrations = [
+        Integration("asyncpg", "asyncpg (Postgres)", "asyncpg driver", ("asyncpg",)),
+    ]
+
+    instructions = generate_integration_instructions(integrations)
+
+    assert "# Databases" in instructions
+    assert "# asyncpg (Postgres) is auto-instrumented" in instructions
+
+
 def test_generate_instructions_complete():
     """Test complete instruction generation."""
     integrations = [
-        Integration("fastapi", "FastAPI", "FastAPI framework", ["fastapi"]),
+        Integration("fastapi", "FastAPI", "FastAPI framework", ("fastapi",)),
     ]
 
     instructions = generate_instructions(integrations)
@@ -133,6 +145,9 @@ if __name__ == "__main__":
     test_generate_integration_instructions_multiple()
     print("✓ test_generate_integration_instructions_multiple")
 
+    test_generate_integration_instructions_auto_instrumented()
+    print("✓ test_generate_integration_instructions_auto_instrumented")
+
     test_generate_instructions_complete()
     print("✓ test_generate_instructions_complete")
 
@@ -0,0 +1,62 @@
+"""Tests for the interactive CLI flow."""
+
+import io
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from rich.console import Console
+
+from logfire_setup.main import prompt_agents_md_addition
+
+
+def _prompt_output(project_dir: Path) -> str:
+    """Run prompt_agents_md_addition, declining, and return what it printed."""
+    out = io.StringIO()
+    with (
+        mock.patch(
+            "logfire_setup.main.get_console",
+            return_value=Console(file=out, width=200),
+        ),
+        mock.patch("rich.prompt.Confirm.ask", return_value=False),
+    ):
+        prompt_agents_md_addition([], project_dir)
+    return out.getvalue()
+
+
+def test_prompt_agents_md_addition_local_file():
+    """Test a file inside the project is shown by name."""
+    with TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        (project_dir / "AGENTS.md").write_text("# Agents")
+
+        output = _prompt_output(project_dir)
+        assert "Found: AGENTS.md" in output
+        assert "outside project" not in output
+
+
+def test_prompt_agents_md_addition_symlinked_claude_dir():
+    """Test a .claude directory symlinked out of the project is flagged."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        dotfiles = tmpdir / "dotfiles"
+        dotfiles.mkdir()
+        (dotfiles / "CLAUDE.md").write_text("# Claude")
+
+        project_dir = tmpdir / "project"
+        project_dir.mkdir()
+        (project_dir / ".claude").symlink_to(dotfiles)
+
+        output = _prompt_output(project_dir)
+        assert "(outside project)" in output
+        assert "dotfiles" in output
+
+
+if __name__ == "__main__":
+    test_prompt_agents_md_addition_local_file()
+    print("✓ test_prompt_agents_md_addition_local_file")
+
+    test_prompt_agents_md_addition_symlinked_claude_dir()
+    print("✓ test_prompt_agents_md_addition_symlinked_claude_dir")
+
+    print("\nAll main tests passed!")
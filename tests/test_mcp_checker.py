@@ -1,11 +1,18 @@
 """Tests for MCP configuration checker."""
 
 import json
+import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Any
+from unittest import mock
 
-from logfire_setup.mcp_checker import find_mcp_config, get_mcp_config_example
+from logfire_setup.mcp_checker import (
+    _find_mcp_config_uncached,
+    clear_mcp_config_cache,
+    find_mcp_config,
+    get_mcp_config_example,
+)
 
 
 def test_find_mcp_config_cursor():
@@ -27,19 +34,11 @@ def test_find_mcp_config_cursor():
         }
         mcp_config.write_text(json.dumps(config_data))
 
-        # Mock cwd to temp directory
-        import os
-
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            mcp_config_check = find_mcp_config()
-            assert mcp_config_check.is_configured is True
-            assert mcp_config_check.config_file_path is not None
-            assert mcp_config_check.config_file_path.resolve() == mcp_config.resolve()
-            assert mcp_config_check.has_read_token is True
-        finally:
-            os.chdir(original_cwd)
+        mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.is_configured is True
+        assert mcp_config_check.config_file_path is not None
+        assert os.path.samefile(mcp_config_check.config_file_path, mcp_config)
+        assert mcp_config_check.has_read_token is True
 
 
 def test_find_mcp_config_no_token():
@@ -60,34 +59,132 @@ def test_find_mcp_config_no_token():
         }
         mcp_config.write_text(json.dumps(config_data))
 
-        import os
-
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            mcp_config_check = find_mcp_config()
-            assert mcp_config_check.is_configured is True
-            assert mcp_config_check.config_file_path is not None
-            assert mcp_config_check.config_file_path.resolve() == mcp_config.resolve()
-            assert mcp_config_check.has_read_token is False
-        finally:
-            os.chdir(original_cwd)
+        mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.is_configured is True
+        assert mcp_config_check.config_file_path is not None
+        assert os.path.samefile(mcp_config_check.config_file_path, mcp_config)
+        assert mcp_config_check.has_read_token is False
 
 
 def test_find_mcp_config_not_found():
     """Test when no MCP config exists."""
     with TemporaryDirectory() as tmpdir:
-        import os
-
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            mcp_config_check = find_mcp_config()
-            assert mcp_config_check.is_configured is False
-            assert mcp_config_check.config_file_path is None
+        mcp_config_check = find_mcp_config(Path(tmpdir))
+        assert mcp_config_check.is_configured is False
+        assert mcp_config_check.config_file_path is None
+        assert mcp_config_check.has_read_token is False
+
+
+def test_find_mcp_config_location_order():
+    """Test that earlier config locations win when several exist."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / ".cursor").mkdir()
+        (tmpdir / ".cursor" / "mcp.json").write_text(
+            json.dumps({"mcpServers": {"logfire": {"args": ["logfire-mcp"]}}})
+        )
+        root_config = tmpdir / ".mcp.json"
+        root_config.write_text(
+            json.dumps(
+                {"mcpServers": {"logfire": {"env": {"LOGFIRE_READ_TOKEN": "t"}}}}
+            )
+        )
+
+        mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.config_file_path == root_config
+        assert mcp_config_check.has_read_token is True
+
+
+def test_find_mcp_config_skips_invalid_json():
+    """Test that unparseable or non-object configs fall through to later ones."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / ".mcp.json").write_text("{not json")
+        (tmpdir / "cline_mcp_settings.json").write_text("[]")
+        (tmpdir / ".vscode").mkdir()
+        vscode_config = tmpdir / ".vscode" / "mcp.json"
+        vscode_config.write_text(json.dumps({"servers": {"logfire": {"args": []}}}))
+
+        mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.config_file_path == vscode_config
+        assert mcp_config_check.has_read_token is False
+
+
+def test_find_mcp_config_cached_until_cleared():
+    """Test that a config created after a lookup is only found after clearing."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        assert find_mcp_config(tmpdir).is_configured is False
+
+        (tmpdir / ".cursor").mkdir()
+        mcp_config = tmpdir / ".cursor" / "mcp.json"
+        mcp_config.write_text(json.dumps({"mcpServers": {"logfire": {"args": []}}}))
+        assert find_mcp_config(tmpdir).is_configured is False
+
+        clear_mcp_config_cache()
+        mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.is_configured is True
+        assert mcp_config_check.config_file_path == mcp_config
+
+
+def test_find_mcp_config_skips_known_missing_dirs():
+    """Test a repeat search skips config dirs already found missing."""
+    with TemporaryDirectory() as tmpdir, TemporaryDirectory() as home:
+        tmpdir, home = Path(tmpdir), Path(home)
+        clear_mcp_config_cache()
+        claude_desktop_dir = home / "Library" / "Application Support" / "Claude"
+
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            _find_mcp_config_uncached(tmpdir, home)
+        scanned = [Path(call.args[0]) for call in scandir.call_args_list]
+        assert scanned == [tmpdir, claude_desktop_dir]
+
+        # Bypass the result cache to search the same project again
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            _find_mcp_config_uncached(tmpdir, home)
+        scanned = [Path(call.args[0]) for call in scandir.call_args_list]
+        assert scanned == [tmpdir]
+
+
+def test_find_mcp_config_resets_missing_dirs_for_new_project():
+    """Test searching another project forgets the missing dirs of the last one."""
+    with TemporaryDirectory() as tmpdir, TemporaryDirectory() as other_project:
+        tmpdir = Path(tmpdir)
+        clear_mcp_config_cache()
+        assert find_mcp_config(tmpdir).is_configured is False
+
+        (tmpdir / ".cursor").mkdir()
+        mcp_config = tmpdir / ".cursor" / "mcp.json"
+        mcp_config.write_text(json.dumps({"mcpServers": {"logfire": {"args": []}}}))
+        assert find_mcp_config(Path(other_project)).is_configured is False
+
+        # Nothing is cleared: a different home only sidesteps the result
+        # cache, so .cursor is found because searching other_project reset
+        # the missing-dir set
+        with mock.patch("pathlib.Path.home", return_value=Path(other_project)):
+            mcp_config_check = find_mcp_config(tmpdir)
+        assert mcp_config_check.config_file_path == mcp_config
+
+
+def test_find_mcp_config_malformed_entry():
+    """Test that a logfire entry with malformed args or env is configured, no token."""
+    with TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        root_config = tmpdir / ".mcp.json"
+        for entry in (
+            {"env": None},
+            {"args": None},
+            {"args": 5},
+            {"args": "--read-token=x"},
+            {"env": ["LOGFIRE_READ_TOKEN"]},
+        ):
+            root_config.write_text(json.dumps({"mcpServers": {"logfire": entry}}))
+            clear_mcp_config_cache()
+
+            mcp_config_check = find_mcp_config(tmpdir)
+            assert mcp_config_check.is_configured is True
+            assert mcp_config_check.config_file_path == root_config
             assert mcp_config_check.has_read_token is False
-        finally:
-            os.chdir(original_cwd)
 
 
 def test_get_mcp_config_example():
@@ -112,6 +209,24 @@ if __name__ == "__main__":
     test_find_mcp_config_not_found()
     print("✓ test_find_mcp_config_not_found")
 
+    test_find_mcp_config_location_order()
+    print("✓ test_find_mcp_config_location_order")
+
+    test_find_mcp_config_skips_invalid_json()
+    print("✓ test_find_mcp_config_skips_invalid_json")
+
+    test_find_mcp_config_cached_until_cleared()
+    print("✓ test_find_mcp_config_cached_until_cleared")
+
+    test_find_mcp_config_skips_known_missing_dirs()
+    print("✓ test_find_mcp_config_skips_known_missing_dirs")
+
+    test_find_mcp_config_resets_missing_dirs_for_new_project()
+    print("✓ test_find_mcp_config_resets_missing_dirs_for_new_project")
+
+    test_find_mcp_config_malformed_entry()
+    print("✓ test_find_mcp_config_malformed_entry")
+
     test_get_mcp_config_example()
     print("✓ test_get_mcp_config_example")
 